@@ -1,9 +1,46 @@
 import os
+import sys
 from dotenv import load_dotenv
 from .hatena_client import HatenaBookmarkClient
 from .article_filter import ArticleFilter
 from .slack_notifier import SlackNotifier
-from .storage import ArticleStorage
+from .storage import ArticleStorage, StorageError
+
+def _notify_new_articles(storage, articles, article_filter, slack,
+                         max_notify_count, lookback_days) -> bool:
+    """未通知記事をSlackに送り既読として記録（通知した場合 True）"""
+    # 既読URL取得
+    notified_urls = storage.get_notified_urls(days=lookback_days)
+    print(f"📊 既読記事数: {len(notified_urls)}")
+    
+    # フィルタリング
+    filtered_articles = article_filter.filter_articles(articles, notified_urls)
+    print(f"✅ 通知対象: {len(filtered_articles)}件")
+    
+    if not filtered_articles:
+        print("通知する記事がありませんでした")
+        return False
+    
+    # カテゴリ分類
+    category_map = {
+        article['url']: article_filter.categorize_article(article)
+        for article in filtered_articles
+    }
+    
+    # Slack通知
+    slack.send_articles(filtered_articles[:max_notify_count], category_map)
+    
+    # 既読として記録
+    storage.add_notified_articles(filtered_articles)
+    return True
+
+def _exit_storage_error(error: StorageError):
+    """ストレージ破損時に復旧手順を表示して終了"""
+    print(f"❌ {error}")
+    print("  既読データを読み込めないため、再通知を防ぐために処理を中止しました。")
+    print("  git 履歴から復元してください: git checkout HEAD~1 -- data/notified_articles.json")
+    print("  履歴を破棄してよい場合は {\"articles\": []} で上書きしてください。")
+    sys.exit(1)
 
 def main():
     """メイン処理"""
@@ -25,34 +62,23 @@ def main():
     max_notify_count = int(os.environ.get('MAX_NOTIFY_COUNT', 20))
     lookback_days = int(os.environ.get('LOOKBACK_DAYS', 0))
     
-    # 既読URL取得
-    notified_urls = storage.get_notified_urls(days=lookback_days)
-    print(f"📊 既読記事数: {len(notified_urls)}")
-    
-    # はてブから記事取得
+    # はてブから記事取得（ストレージに触れないのでロック外で行う）
     articles = hatena.get_hotentry(category=category, limit=fetch_limit)
     print(f"📥 取得記事数: {len(articles)}")
     
-    # フィルタリング
-    filtered_articles = article_filter.filter_articles(articles, notified_urls)
-    print(f"✅ 通知対象: {len(filtered_articles)}件")
+    # 既読確認〜通知〜記録は並列に動く他のワーカーと排他にする
+    try:
+        with storage.locked():
+            notified = _notify_new_articles(
+                storage, articles, article_filter, slack,
+                max_notify_count, lookback_days
+            )
+    except StorageError as e:
+        _exit_storage_error(e)
     
-    if not filtered_articles:
-        print("通知する記事がありませんでした")
+    if not notified:
         return
     
-    # カテゴリ分類
-    category_map = {
-        article['url']: article_filter.categorize_article(article)
-        for article in filtered_articles
-    }
-    
-    # Slack通知
-    slack.send_articles(filtered_articles[:max_notify_count], category_map)
-    
-    # 既読として記録
-    storage.add_notified_articles(filtered_articles)
-    
     # 統計表示
     stats = storage.get_statistics()
     print(f"\n📈 統計情報:")
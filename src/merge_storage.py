@@ -0,0 +1,44 @@
+import json
+import sys
+from .storage import merge_article_records
+
+def _load(path: str, allow_empty: bool = False) -> dict:
+    """JSON読み込み（共通祖先が無い場合の空ファイルは空データ扱い）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if allow_empty and not text.strip():
+        return {'articles': []}
+    return json.loads(text)
+
+def main():
+    """git マージドライバ: notified_articles.json の articles をURLで統合
+
+    両側の記録を合わせた上で、共通祖先(%O)にあり片側でも削除された
+    （cleanup_days で整理された）URLは復活させずに取り除く。
+
+    使い方: python -m src.merge_storage %O %A %B （結果は %A に書き込む）
+    """
+    base_path, current_path, other_path = sys.argv[1:4]
+
+    try:
+        base = _load(base_path, allow_empty=True)
+        current = _load(current_path)
+        other = _load(other_path)
+        base_urls = {a['url'] for a in base['articles']}
+        current_urls = {a['url'] for a in current['articles']}
+        other_urls = {a['url'] for a in other['articles']}
+        removed_urls = (base_urls - current_urls) | (base_urls - other_urls)
+        merged = [
+            a for a in merge_article_records(current['articles'], other['articles'])
+            if a['url'] not in removed_urls
+        ]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # 統合できない場合はコンフリクトとして git に任せる
+        print(f"❌ 既読データを統合できませんでした: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(current_path, 'w', encoding='utf-8') as f:
+        json.dump({**current, 'articles': merged}, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,138 @@
 import json
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Set, Dict, List
 from datetime import datetime, timedelta
 
+try:
+    import fcntl
+except ImportError:  # Windows など fcntl が無い環境ではロックなしで動作
+    fcntl = None
+
+
+class StorageError(RuntimeError):
+    """ストレージファイルが読み込めない（壊れている）"""
+
+
+def merge_article_records(*record_lists: List[Dict]) -> List[Dict]:
+    """記録をURLごとに1件にまとめる（書き込み順を保ち、同じURLは後の記録を残す）
+
+    notified_at は実行環境のタイムゾーンに依存する naive な時刻のため比較に使わない
+    """
+    merged = {}
+    for records in record_lists:
+        for a in records:
+            merged.pop(a['url'], None)
+            merged[a['url']] = a
+    return list(merged.values())
+
+
 class ArticleStorage:
     """既読記事の管理"""
     
     def __init__(self, storage_path: str = "data/notified_articles.json", cleanup_days: int = 90):
         self.storage_path = Path(storage_path)
+        self.lock_path = self.storage_path.with_name(self.storage_path.name + '.lock')
         self.cleanup_days = cleanup_days
+        self._local = threading.local()
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self._ensure_file_exists()
     
+    @contextmanager
+    def locked(self):
+        """既読確認〜通知〜記録を他プロセスと排他にする（ネスト可）"""
+        with self._lock():
+            yield
+    
+    @contextmanager
+    def _lock(self, exclusive: bool = True):
+        """プロセス間ロック（ロック専用ファイルに flock、スレッドごとにネスト可）"""
+        depth = getattr(self._local, 'depth', 0)
+        if depth > 0:
+            # このスレッドで既に排他ロック取得済み
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        
+        # flock はオープンごとのロックなので、別スレッドとも排他になる
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._local.depth = 1 if exclusive else 0
+            try:
+                yield
+            finally:
+                self._local.depth = 0
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
     def _ensure_file_exists(self):
         """ストレージファイルの存在確認"""
-        if not self.storage_path.exists():
-            self._save_data({'articles': []})
+        with self._lock():
+            if not self.storage_path.exists():
+                self._save_data({'articles': []})
     
     def _load_data(self) -> Dict:
-        """データ読み込み"""
+        """データ読み込み（ファイルが無い場合のみ空扱い）"""
         try:
             with open(self.storage_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
+                data = json.load(f)
+        except FileNotFoundError:
             return {'articles': []}
+        except ValueError as e:  # JSONDecodeError / 途中で切れたマルチバイト文字の UnicodeDecodeError
+            # 空扱いにすると全記事を再通知してしまうため、処理を止める
+            raise StorageError(f"ストレージファイルが壊れています: {self.storage_path}") from e
+        if not (isinstance(data, dict) and isinstance(data.get('articles'), list)):
+            raise StorageError(f"ストレージファイルの形式が不正です: {self.storage_path}")
+        return data
     
     def _save_data(self, data: Dict):
-        """データ保存"""
-        with open(self.storage_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        """データ保存（一時ファイルに書き込み fsync 後に rename）"""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.storage_path.parent, prefix=self.storage_path.name + '.', suffix='.tmp'
+        )
+        try:
+            os.fchmod(fd, self._file_mode())
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.storage_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._fsync_dir()
+    
+    def _file_mode(self) -> int:
+        """保存ファイルのパーミッション（mkstemp の 0600 を引き継がない）"""
+        try:
+            return stat.S_IMODE(os.stat(self.storage_path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+    
+    def _fsync_dir(self):
+        """rename をディスクに反映させるためディレクトリを fsync"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        dir_fd = os.open(self.storage_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
     
     def get_notified_urls(self, days: int = 30) -> Set[str]:
         """既読URLセットを取得（指定日数以内）"""
-        data = self._load_data()
+        with self._lock(exclusive=False):
+            data = self._load_data()
         cutoff_date = None if days <= 0 else datetime.now() - timedelta(days=days)
         
         urls = set()
@@ -44,17 +144,26 @@ class ArticleStorage:
         return urls
     
     def add_notified_articles(self, articles: List[Dict]):
-        """通知済み記事を追加"""
-        data = self._load_data()
+        """通知済み記事を追加（ロック内で最新データを読み直してマージ）"""
+        with self._lock():
+            data = self._load_data()
+            self._merge_articles(data, articles)
+            self._save_data(data)
+    
+    def _merge_articles(self, data: Dict, articles: List[Dict]):
+        """既存データに記事をマージ（URLごとに最新の記録1件にまとめる）"""
+        new_records = []
         
         for article in articles:
-            data['articles'].append({
+            new_records.append({
                 'url': article['url'],
                 'title': article['title'],
                 'bookmarks': article['bookmarks'],
                 'notified_at': datetime.now().isoformat()
             })
         
+        data['articles'] = merge_article_records(data['articles'], new_records)
+        
         # 古いデータをクリーンアップ（指定日数以上前）
         if self.cleanup_days > 0:
             cutoff = datetime.now() - timedelta(days=self.cleanup_days)
@@ -62,12 +171,11 @@ class ArticleStorage:
                 a for a in data['articles']
                 if datetime.fromisoformat(a['notified_at']) > cutoff
             ]
-        
-        self._save_data(data)
     
     def get_statistics(self) -> Dict:
         """統計情報を取得"""
-        data = self._load_data()
+        with self._lock(exclusive=False):
+            data = self._load_data()
         articles = data.get('articles', [])
         
         if not articles: